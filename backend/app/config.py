@@ -18,8 +18,13 @@ class Settings(BaseSettings):
     auth_username: str = ""
     auth_password: str = ""
     database_url: str = ""
+    db_pool_min: int = 5
+    db_pool_max: int = 20
     jwt_secret: str = ""
     jwt_expiry_hours: int = 24
+    password_scheme: str = "argon2"  # "argon2" (default) or "bcrypt"
+    bcrypt_cost: int = 12  # 0 or less → auto-calibrate to BCRYPT_TARGET_MS at startup
+    bcrypt_target_ms: int = 100
 
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -4,7 +4,10 @@ Run: uvicorn app.main:app --reload --port 8001
 Docs: http://localhost:8001/docs
 """
 
+import asyncio
+import os
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
 from pathlib import Path
 
@@ -23,7 +26,9 @@ load_dotenv(Path(__file__).resolve().parent.parent / ".env")
 from app.config import load_settings  # noqa: E402
 from app.core.constants import RATE_LIMIT_PER_MINUTE  # noqa: E402
 from app.core.logger import logger  # noqa: E402
-from app.middleware import RequestIdMiddleware, JWTAuthMiddleware, request_id_var  # noqa: E402
+from app.middleware import (  # noqa: E402
+    HealthMiddleware, RequestIdMiddleware, JWTAuthMiddleware, request_id_var,
+)
 from app.routes import tailor, health  # noqa: E402
 
 settings = load_settings()
@@ -35,16 +40,32 @@ limiter = Limiter(key_func=get_remote_address)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Startup: create DB pool + users table. Shutdown: close pool."""
+    # Size the default executor above asyncio's conservative default so the
+    # password-hashing offloads (asyncio.to_thread) don't queue behind
+    # each other under concurrent logins.
+    executor = ThreadPoolExecutor(
+        max_workers=(os.cpu_count() or 1) * 2, thread_name_prefix="worker"
+    )
+    asyncio.get_running_loop().set_default_executor(executor)
     if settings.database_url:
         from app.core.database import create_pool, ensure_users_table, close_pool
-        pool = await create_pool(settings.database_url)
+        pool = await create_pool(
+            settings.database_url,
+            min_size=settings.db_pool_min,
+            max_size=settings.db_pool_max,
+        )
         await ensure_users_table(pool)
         app.state.pool = pool
         logger.info("Database pool initialized")
+        # Resolve the bcrypt work factor now (may run a short calibration)
+        # so the first register/login doesn't pay for it.
+        from app.core.auth import _bcrypt_cost
+        logger.info(f"bcrypt cost factor: {_bcrypt_cost()}")
     yield
     if hasattr(app.state, "pool"):
         from app.core.database import close_pool
         await close_pool(app.state.pool)
+    executor.shutdown(wait=False)
 
 
 app = FastAPI(
@@ -57,6 +78,9 @@ app = FastAPI(
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
+# Health fast path (innermost — short-circuits GET /api/health before routing)
+app.add_middleware(HealthMiddleware)
+
 ALLOWED_ORIGINS = settings.allowed_origins.split(",")
 app.add_middleware(
     CORSMiddleware,
@@ -4,19 +4,46 @@ Uses pure ASGI middleware (not BaseHTTPMiddleware) to avoid buffering
 StreamingResponse, which is needed for the SSE endpoint.
 """
 
-import json
+import hmac
 import logging
-import uuid
+import os
+import time
 from contextvars import ContextVar
 
-from starlette.datastructures import MutableHeaders
+import orjson
+
 from starlette.types import ASGIApp, Receive, Scope, Send
 
+from app.core.auth import decode_token_cached
+
 logger = logging.getLogger("resume_tailor.middleware")
 
 request_id_var: ContextVar[str] = ContextVar("request_id", default="-")
 
 
+def _build_401(detail: str) -> tuple[bytes, list]:
+    """Precompute the (body, headers) pair for a fixed 401 response."""
+    body = orjson.dumps({"detail": detail})
+    headers = [
+        [b"content-type", b"application/json"],
+        [b"content-length", str(len(body)).encode()],
+    ]
+    return body, headers
+
+
+_401_MISSING_AUTH = _build_401("Missing or invalid Authorization header")
+_401_BAD_TOKEN = _build_401("Invalid or expired token")
+_401_BAD_CREDS = _build_401("Invalid credentials")
+
+
+def _get_header(headers: list, name: bytes) -> bytes:
+    """Return the first value for a header from a raw ASGI header list."""
+    for key, value in headers:
+        if key == name:
+            return value
+    return b""
+
+
 class RequestIdMiddleware:
     """Attach an 8-char request ID to every request/response cycle."""
 
@@ -28,19 +55,82 @@ class RequestIdMiddleware:
             await self.app(scope, receive, send)
             return
 
-        rid = uuid.uuid4().hex[:8]
+        # 4 random bytes → 8 hex chars; same entropy source as uuid4 but
+        # without building a UUID object just to slice its hex.
+        rid = os.urandom(4).hex()
         request_id_var.set(rid)
-        scope.setdefault("state", {})["request_id"] = rid
+        # Starlette normally populates scope["state"] already; only allocate
+        # a dict when it hasn't (avoids setdefault's unconditional {} arg).
+        state = scope.get("state")
+        if state is None:
+            state = {}
+            scope["state"] = state
+        state["request_id"] = rid
+
+        # Append the raw header pair directly — MutableHeaders would re-parse
+        # the whole header list just to add one entry.
+        header_pair = (b"x-request-id", rid.encode())
 
         async def send_with_rid(message: dict) -> None:
             if message["type"] == "http.response.start":
-                headers = MutableHeaders(scope=message)
-                headers.append("X-Request-ID", rid)
+                headers = message.get("headers")
+                if headers is None:
+                    message["headers"] = [header_pair]
+                else:
+                    headers.append(header_pair)
             await send(message)
 
         await self.app(scope, receive, send_with_rid)
 
 
+class HealthMiddleware:
+    """Serve GET /api/health without touching the FastAPI router.
+
+    Load-balancer probes make this the hottest path in a deployment;
+    answering from a precomputed body (refreshed at most once per
+    second — only uptime_seconds changes) skips route resolution and
+    response serialization entirely.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self._start = time.monotonic()
+        self._body = b""
+        self._headers: list = []
+        self._refreshed = float("-inf")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope.get("path") != "/api/health"
+            or scope.get("method") != "GET"
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        now = time.monotonic()
+        if now - self._refreshed > 1.0:
+            self._body = orjson.dumps({
+                "status": "ok",
+                "service": "resume-tailor",
+                "version": "1.0.0",
+                "uptime_seconds": round(now - self._start),
+            })
+            self._headers = [
+                [b"content-type", b"application/json"],
+                [b"content-length", str(len(self._body)).encode()],
+            ]
+            self._refreshed = now
+
+        # Copy the header list — outer middleware (request ID) appends to it.
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": list(self._headers),
+        })
+        await send({"type": "http.response.body", "body": self._body})
+
+
 class JWTAuthMiddleware:
     """Block /api/tailor* requests that lack a valid JWT.
 
@@ -57,6 +147,9 @@ class JWTAuthMiddleware:
         self.jwt_secret = jwt_secret
         self.username = username
         self.password = password
+        # Pre-encoded for constant-time comparison against raw header bytes
+        self._username_b = username.encode()
+        self._password_b = password.encode()
 
     async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         if scope["type"] != "http":
@@ -75,48 +168,61 @@ class JWTAuthMiddleware:
             await self.app(scope, receive, send)
             return
 
+        # Scan the raw header list for just the headers we need instead of
+        # materializing a full dict per request.
         headers_list = scope.get("headers", [])
-        headers = {k: v for k, v in headers_list}
 
         # JWT mode
         if self.jwt_secret:
-            auth_header = headers.get(b"authorization", b"").decode()
+            auth_header = _get_header(headers_list, b"authorization").decode()
             if not auth_header.startswith("Bearer "):
-                await self._send_401(send, "Missing or invalid Authorization header")
+                await self._send_401(send, _401_MISSING_AUTH)
                 return
 
             token = auth_header[7:]
             try:
-                from app.core.auth import decode_token
-                payload = decode_token(token)
-                scope.setdefault("state", {})["user_id"] = payload["sub"]
-                scope["state"]["username"] = payload["username"]
+                payload = decode_token_cached(token)
+                state = scope.get("state")
+                if state is None:
+                    state = {}
+                    scope["state"] = state
+                state["user_id"] = payload["sub"]
+                state["username"] = payload["username"]
             except Exception:
-                await self._send_401(send, "Invalid or expired token")
+                await self._send_401(send, _401_BAD_TOKEN)
                 return
 
             await self.app(scope, receive, send)
             return
 
-        # Fallback: env-based password check
-        req_user = headers.get(b"x-auth-username", b"").decode()
-        req_pass = headers.get(b"x-auth-password", b"").decode()
-
-        if req_user != self.username or req_pass != self.password:
-            await self._send_401(send, "Invalid credentials")
+        # Fallback: env-based password check — grab both headers in one pass
+        req_user = b""
+        req_pass = b""
+        for key, value in headers_list:
+            if key == b"x-auth-username":
+                req_user = value
+            elif key == b"x-auth-password":
+                req_pass = value
+
+        # Constant-time compare on the raw bytes (no decode); & instead of
+        # `and` so both checks always run — no timing leak on the username.
+        valid = hmac.compare_digest(req_user, self._username_b) & hmac.compare_digest(
+            req_pass, self._password_b
+        )
+        if not valid:
+            await self._send_401(send, _401_BAD_CREDS)
             return
 
         await self.app(scope, receive, send)
 
     @staticmethod
-    async def _send_401(send: Send, detail: str) -> None:
-        body = json.dumps({"detail": detail}).encode()
+    async def _send_401(send: Send, response: tuple[bytes, list]) -> None:
+        body, headers = response
+        # Copy the header list — outer middleware (request ID) appends to
+        # it, and the precomputed lists are shared across requests.
         await send({
             "type": "http.response.start",
             "status": 401,
-            "headers": [
-                [b"content-type", b"application/json"],
-                [b"content-length", str(len(body)).encode()],
-            ],
+            "headers": list(headers),
         })
         await send({"type": "http.response.body", "body": body})
@@ -1,11 +1,14 @@
 """Authentication endpoints — register, login."""
 
+import asyncio
 import logging
 
-from fastapi import APIRouter, HTTPException, Request
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
 
-from app.core.auth import hash_password, verify_password, create_token
+from app.core.auth import hash_password, verify_password, needs_rehash, create_token
+from app.middleware import request_id_var
 
 logger = logging.getLogger("resume_tailor.auth")
 
@@ -27,23 +30,89 @@ class AuthResponse(BaseModel):
     username: str
 
 
+class LoginBatcher:
+    """Coalesce concurrent login lookups into one ANY($1) query.
+
+    Logins that arrive in the same event-loop tick share a single
+    SELECT ... WHERE username = ANY($1) round-trip instead of issuing
+    one query each. A lone login still flushes on the next tick, so the
+    low-QPS case pays no extra latency; the win appears under burst,
+    where N concurrent logins cost one parse/plan/execute cycle.
+    """
+
+    _SQL = (
+        "SELECT id, password_hash, username FROM users "
+        "WHERE username = ANY($1::text[])"
+    )
+
+    def __init__(self) -> None:
+        self._pending: dict[str, list[asyncio.Future]] = {}
+        self._flush_task: asyncio.Task | None = None
+
+    async def fetch(self, pool, username: str):
+        """Return the user row for username (None if absent)."""
+        fut = asyncio.get_running_loop().create_future()
+        self._pending.setdefault(username, []).append(fut)
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush(pool))
+        return await fut
+
+    async def _flush(self, pool) -> None:
+        # Yield once so every login already scheduled this tick can enqueue.
+        await asyncio.sleep(0)
+        # Keep draining: logins that enqueue while a query is in flight see
+        # a live flush task and rely on it to run another batch for them.
+        while self._pending:
+            pending, self._pending = self._pending, {}
+            try:
+                rows = await pool.fetch(self._SQL, list(pending))
+            except Exception as exc:
+                for futures in pending.values():
+                    for fut in futures:
+                        if not fut.done():
+                            fut.set_exception(exc)
+                continue
+            by_name = {row["username"]: row for row in rows}
+            for username, futures in pending.items():
+                row = by_name.get(username)
+                for fut in futures:
+                    if not fut.done():
+                        fut.set_result(row)
+
+
+_login_batcher = LoginBatcher()
+
+
+def _error_response(status_code: int, detail: str) -> JSONResponse:
+    """Build an error response directly — skips HTTPException unwinding.
+
+    Matches the body shape of the global HTTPException handler
+    (detail + request_id) without the raise/catch round-trip through
+    the middleware stack.
+    """
+    return JSONResponse(
+        status_code=status_code,
+        content={"detail": detail, "request_id": request_id_var.get("-")},
+    )
+
+
 @router.post("/api/auth/register", response_model=AuthResponse)
 async def register(request: Request, body: RegisterRequest):
     """Create a new user account."""
     pool = request.app.state.pool
-    hashed = hash_password(body.password)
-
-    async with pool.acquire() as conn:
-        existing = await conn.fetchrow(
-            "SELECT id FROM users WHERE username = $1", body.username
-        )
-        if existing:
-            raise HTTPException(status_code=409, detail="Username already taken")
-
-        row = await conn.fetchrow(
-            "INSERT INTO users (username, password_hash) VALUES ($1, $2) RETURNING id",
-            body.username, hashed,
-        )
+    # bcrypt is ~250 ms of CPU — run it in a worker thread (bcrypt releases
+    # the GIL) so the event loop keeps serving other requests.
+    hashed = await asyncio.to_thread(hash_password, body.password)
+
+    # Single round-trip: the UNIQUE constraint on username decides the
+    # conflict atomically, so no SELECT-then-INSERT race window.
+    row = await pool.fetchrow(
+        "INSERT INTO users (username, password_hash) VALUES ($1, $2) "
+        "ON CONFLICT (username) DO NOTHING RETURNING id",
+        body.username, hashed,
+    )
+    if row is None:
+        return _error_response(409, "Username already taken")
 
     user_id = row["id"]
     token = create_token(user_id, body.username)
@@ -55,15 +124,21 @@ async def register(request: Request, body: RegisterRequest):
 async def login(request: Request, body: LoginRequest):
     """Authenticate with username + password, receive JWT."""
     pool = request.app.state.pool
-
-    async with pool.acquire() as conn:
-        row = await conn.fetchrow(
-            "SELECT id, password_hash FROM users WHERE username = $1",
-            body.username,
+    row = await _login_batcher.fetch(pool, body.username)
+
+    # Run bcrypt verification off the event loop — same reasoning as register.
+    if not row or not await asyncio.to_thread(
+        verify_password, body.password, row["password_hash"]
+    ):
+        return _error_response(401, "Invalid username or password")
+
+    # Migrate legacy bcrypt hashes to the current scheme on successful login.
+    if needs_rehash(row["password_hash"]):
+        new_hash = await asyncio.to_thread(hash_password, body.password)
+        await pool.execute(
+            "UPDATE users SET password_hash = $1 WHERE id = $2", new_hash, row["id"]
         )
-
-    if not row or not verify_password(body.password, row["password_hash"]):
-        raise HTTPException(status_code=401, detail="Invalid username or password")
+        logger.info("Password hash upgraded for user: %s", body.username)
 
     token = create_token(row["id"], body.username)
     logger.info("User logged in: %s", body.username)
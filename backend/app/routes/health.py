@@ -1,18 +1,27 @@
 """Health check + auth verify endpoints."""
 
+import hmac
 import time
+from functools import lru_cache
 
 from fastapi import APIRouter, Request
 
 from app.config import load_settings
+from app.core.auth import decode_token
 
 router = APIRouter(tags=["System"])
 
 _start_time = time.monotonic()
 
+# Settings are immutable after startup — resolve once instead of per request.
+_settings = lru_cache(maxsize=1)(load_settings)
+
 
 @router.get("/api/health")
 async def health():
+    """Liveness check. In production GET /api/health is answered by
+    HealthMiddleware before routing; this handler keeps the endpoint in
+    the OpenAPI docs and serves as fallback."""
     return {
         "status": "ok",
         "service": "resume-tailor",
@@ -29,7 +38,7 @@ async def verify_auth(request: Request):
     Env mode: validates X-Auth-Username / X-Auth-Password headers.
     Returns {"valid": bool, "auth_enabled": bool, "mode": "jwt"|"env"|"none"}.
     """
-    settings = load_settings()
+    settings = _settings()
 
     # JWT mode — database_url is set
     if settings.jwt_secret:
@@ -37,7 +46,6 @@ async def verify_auth(request: Request):
         if not auth_header.startswith("Bearer "):
             return {"valid": False, "auth_enabled": True, "mode": "jwt"}
         try:
-            from app.core.auth import decode_token
             decode_token(auth_header[7:])
             return {"valid": True, "auth_enabled": True, "mode": "jwt"}
         except Exception:
@@ -49,5 +57,7 @@ async def verify_auth(request: Request):
 
     req_user = request.headers.get("x-auth-username", "")
     req_pass = request.headers.get("x-auth-password", "")
-    valid = req_user == settings.auth_username and req_pass == settings.auth_password
+    valid = hmac.compare_digest(
+        req_user.encode(), settings.auth_username.encode()
+    ) & hmac.compare_digest(req_pass.encode(), settings.auth_password.encode())
     return {"valid": valid, "auth_enabled": True, "mode": "env"}
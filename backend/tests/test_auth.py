@@ -0,0 +1,118 @@
+"""Tests for the login batcher in the auth routes.
+
+LoginBatcher is pure asyncio logic, so it's exercised against a fake
+pool — no database needed.
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.routes.auth import LoginBatcher
+
+
+class FakePool:
+    """Records fetch calls and answers from a fixed set of user rows."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = []
+
+    async def fetch(self, sql, usernames):
+        self.calls.append(sorted(usernames))
+        return [r for r in self.rows if r["username"] in usernames]
+
+
+class SlowPool(FakePool):
+    """FakePool whose queries take real time, like a DB round-trip."""
+
+    def __init__(self, rows, delay):
+        super().__init__(rows)
+        self.delay = delay
+
+    async def fetch(self, sql, usernames):
+        self.calls.append(sorted(usernames))
+        await asyncio.sleep(self.delay)
+        return [r for r in self.rows if r["username"] in usernames]
+
+
+class FailingPool:
+    async def fetch(self, sql, usernames):
+        raise ConnectionError("db down")
+
+
+USERS = [
+    {"id": 1, "username": "alice", "password_hash": "h1"},
+    {"id": 2, "username": "bob", "password_hash": "h2"},
+]
+
+
+@pytest.mark.asyncio
+class TestLoginBatcher:
+    async def test_lone_fetch_returns_row(self):
+        pool = FakePool(USERS)
+        row = await LoginBatcher().fetch(pool, "alice")
+        assert row["id"] == 1
+
+    async def test_unknown_username_returns_none(self):
+        pool = FakePool(USERS)
+        row = await LoginBatcher().fetch(pool, "mallory")
+        assert row is None
+
+    async def test_concurrent_fetches_share_one_query(self):
+        pool = FakePool(USERS)
+        batcher = LoginBatcher()
+        rows = await asyncio.gather(
+            batcher.fetch(pool, "alice"),
+            batcher.fetch(pool, "bob"),
+            batcher.fetch(pool, "mallory"),
+        )
+        assert [r["id"] if r else None for r in rows] == [1, 2, None]
+        assert pool.calls == [["alice", "bob", "mallory"]]
+
+    async def test_duplicate_usernames_resolve_independently(self):
+        pool = FakePool(USERS)
+        batcher = LoginBatcher()
+        r1, r2 = await asyncio.gather(
+            batcher.fetch(pool, "alice"),
+            batcher.fetch(pool, "alice"),
+        )
+        assert r1["id"] == r2["id"] == 1
+        assert pool.calls == [["alice"]]
+
+    async def test_query_failure_propagates_to_all_waiters(self):
+        batcher = LoginBatcher()
+        results = await asyncio.gather(
+            batcher.fetch(FailingPool(), "alice"),
+            batcher.fetch(FailingPool(), "bob"),
+            return_exceptions=True,
+        )
+        assert all(isinstance(r, ConnectionError) for r in results)
+
+    async def test_fetch_during_inflight_query_is_not_dropped(self):
+        """A login arriving mid-query must be flushed by the live task."""
+        pool = SlowPool(USERS, delay=0.05)
+        batcher = LoginBatcher()
+
+        async def late_login():
+            await asyncio.sleep(0.01)  # lands while the first query sleeps
+            return await batcher.fetch(pool, "bob")
+
+        r1, r2 = await asyncio.wait_for(
+            asyncio.gather(batcher.fetch(pool, "alice"), late_login()),
+            timeout=1.0,
+        )
+        assert r1["id"] == 1
+        assert r2["id"] == 2
+        assert pool.calls == [["alice"], ["bob"]]
+
+    async def test_sequential_fetches_issue_separate_queries(self):
+        pool = FakePool(USERS)
+        batcher = LoginBatcher()
+        await batcher.fetch(pool, "alice")
+        await batcher.fetch(pool, "bob")
+        assert pool.calls == [["alice"], ["bob"]]
@@ -42,3 +42,41 @@ class TestRequestIdMiddleware:
         """For error responses, header and body request_id should match."""
         resp = client.get("/api/nonexistent")
         assert resp.headers["X-Request-ID"] == resp.json()["request_id"]
+
+
+class TestJWTAuthMiddleware401:
+    """401 rejections through the stacked request-ID + auth middleware."""
+
+    @pytest.fixture()
+    def auth_client(self):
+        """RequestIdMiddleware wrapping a JWT-protected dummy app, as in main."""
+        from app.middleware import JWTAuthMiddleware, RequestIdMiddleware
+
+        async def inner_app(scope, receive, send):
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            await send({"type": "http.response.body", "body": b"ok"})
+
+        return TestClient(
+            RequestIdMiddleware(JWTAuthMiddleware(inner_app, jwt_secret="sekret"))
+        )
+
+    def test_missing_token_returns_401(self, auth_client):
+        resp = auth_client.get("/api/tailor")
+        assert resp.status_code == 401
+        assert resp.json()["detail"] == "Missing or invalid Authorization header"
+
+    def test_repeated_401s_carry_exactly_one_request_id(self, auth_client):
+        """Precomputed 401 headers must not accumulate request IDs."""
+        r1 = auth_client.get("/api/tailor")
+        r2 = auth_client.get("/api/tailor")
+        assert r1.status_code == r2.status_code == 401
+        assert len(r1.headers.get_list("x-request-id")) == 1
+        assert len(r2.headers.get_list("x-request-id")) == 1
+        assert r1.headers["x-request-id"] != r2.headers["x-request-id"]
+
+    def test_invalid_token_returns_401(self, auth_client):
+        resp = auth_client.get(
+            "/api/tailor", headers={"Authorization": "Bearer not.a.token"}
+        )
+        assert resp.status_code == 401
+        assert resp.json()["detail"] == "Invalid or expired token"
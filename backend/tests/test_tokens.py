@@ -0,0 +1,111 @@
+"""Tests for the hand-rolled JWT signing/verification in app.core.auth.
+
+create_token/decode_token replace jwt.encode/jwt.decode with direct
+HS256 code paths, so these tests pin down cross-compatibility with
+PyJWT in both directions and rejection of bad tokens.
+"""
+
+import base64
+import os
+import sys
+import time
+
+import jwt as pyjwt
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import load_settings
+from app.core import auth
+
+TEST_SECRET = "unit-test-secret-that-is-long-enough"
+
+
+@pytest.fixture(autouse=True)
+def _jwt_secret(monkeypatch):
+    """Point the cached JWT config at a known secret for each test."""
+    monkeypatch.setattr(load_settings(), "jwt_secret", TEST_SECRET)
+    auth._jwt_config.cache_clear()
+    auth._hmac_template.cache_clear()
+    auth._token_cache.clear()
+    yield
+    auth._jwt_config.cache_clear()
+    auth._hmac_template.cache_clear()
+    auth._token_cache.clear()
+
+
+class TestCreateToken:
+    def test_round_trips_through_decode_token(self):
+        payload = auth.decode_token(auth.create_token(42, "jane"))
+        assert payload["sub"] == 42
+        assert payload["username"] == "jane"
+
+    def test_verifies_with_pyjwt(self):
+        """Tokens we mint must stay standard — PyJWT must accept them."""
+        token = auth.create_token(42, "jane")
+        payload = pyjwt.decode(token, TEST_SECRET, algorithms=["HS256"])
+        assert payload["sub"] == "42"
+        assert payload["exp"] - payload["iat"] == load_settings().jwt_expiry_hours * 3600
+
+    def test_header_is_standard_hs256(self):
+        header_b64 = auth.create_token(1, "a").split(".")[0]
+        header = base64.urlsafe_b64decode(header_b64 + "==")
+        assert b'"alg":"HS256"' in header
+
+
+class TestDecodeToken:
+    def _pyjwt_token(self, claims):
+        return pyjwt.encode(claims, TEST_SECRET, algorithm="HS256")
+
+    def test_accepts_pyjwt_minted_token(self):
+        now = int(time.time())
+        token = self._pyjwt_token(
+            {"sub": "9", "username": "bob", "iat": now, "exp": now + 60}
+        )
+        payload = auth.decode_token(token)
+        assert payload["sub"] == 9
+        assert payload["username"] == "bob"
+
+    def test_rejects_expired_token(self):
+        token = self._pyjwt_token(
+            {"sub": "1", "username": "x", "exp": int(time.time()) - 10}
+        )
+        with pytest.raises(pyjwt.ExpiredSignatureError):
+            auth.decode_token(token)
+
+    def test_rejects_tampered_signature(self):
+        token = auth.create_token(1, "a")
+        tampered = token[:-2] + ("xx" if not token.endswith("xx") else "yy")
+        with pytest.raises(pyjwt.InvalidSignatureError):
+            auth.decode_token(tampered)
+
+    def test_rejects_wrong_secret(self):
+        token = pyjwt.encode({"sub": "1", "username": "x"}, "other-secret", algorithm="HS256")
+        with pytest.raises(pyjwt.InvalidSignatureError):
+            auth.decode_token(token)
+
+    def test_rejects_garbage_tokens(self):
+        for garbage in ["", "a.b", "not a token", "a.b.c.d", "!!.!!.!!"]:
+            with pytest.raises(pyjwt.PyJWTError):
+                auth.decode_token(garbage)
+
+    def test_rejects_alg_none_token(self):
+        """Unsigned tokens must fail even though the header claims alg=none."""
+        header = base64.urlsafe_b64encode(b'{"alg":"none","typ":"JWT"}').rstrip(b"=")
+        claims = base64.urlsafe_b64encode(b'{"sub":"1","username":"x"}').rstrip(b"=")
+        token = b".".join([header, claims, b""]).decode()
+        with pytest.raises(pyjwt.PyJWTError):
+            auth.decode_token(token)
+
+
+class TestDecodeTokenCached:
+    def test_cache_hit_returns_same_payload(self):
+        token = auth.create_token(3, "carol")
+        first = auth.decode_token_cached(token)
+        assert auth.decode_token_cached(token) == first
+
+    def test_exp_less_token_survives_cache_hits(self):
+        """A token without exp is valid on every decode, not just the first."""
+        token = pyjwt.encode({"sub": "5", "username": "dan"}, TEST_SECRET, algorithm="HS256")
+        for _ in range(3):
+            assert auth.decode_token_cached(token)["sub"] == 5